@@ -4,29 +4,25 @@ load_dotenv()
 import streamlit  as st
 import os
 import google.generativeai as genai 
+from gemini_helpers import MAX_PROMPT_CHARS,write_response
 
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-### function to load Gemini model
-model=genai.GenerativeModel('gemini-pro')
-def get_gemini_response(question):
-    response=model.generate_content(question)
-    return response.text
-
 ### initialize our streamlit app
 
 st.set_page_config(page_title="Q&A")
 
 st.header("Gemini LLM Application")
 
-input=st.text_input("Input: ",key="input")
+input=st.text_input("Input: ",key="input",max_chars=MAX_PROMPT_CHARS)
 submit=st.button("Ask the question")
 ## When submit button is clicked
 
-if submit:
-    response=get_gemini_response(input)
+if submit and not input.strip():
+    st.warning("Please enter a question first.")
+elif submit:
     st.subheader("The Response is")
-    st.write(response)
+    write_response('gemini-pro',input,input)
 
 
 
@@ -0,0 +1,98 @@
+### helpers shared by app.py and vision.py
+
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit  as st
+import google.generativeai as genai
+from google.api_core import exceptions,retry
+
+## prompts are capped in the input box so oversized ones never reach the API
+MAX_PROMPT_CHARS=30000
+
+## Gemini rejects inline image data over about 20 MB, so bigger uploads are
+## turned away before they are read, hashed or sent
+MAX_IMAGE_BYTES=20*1024*1024
+
+## back off and retry on transient errors (429/503) when opening the stream;
+## the timeout is a deadline for the whole streamed answer, not the first chunk,
+## so it has to leave room for a long generation
+REQUEST_OPTIONS={"retry":retry.Retry(initial=1.0,multiplier=2.0,maximum=8.0,timeout=60.0),"timeout":300}
+
+### function to load Gemini model
+## one model object per name, shared by every rerun and session
+@st.cache_resource
+def load_model(model_name):
+    return genai.GenerativeModel(model_name)
+
+def get_gemini_response(model_name,contents):
+    model=load_model(model_name)
+    ## stream the answer so the first words show up before generation finishes
+    return model.generate_content(contents,stream=True,request_options=REQUEST_OPTIONS)
+
+def stream_text(response):
+    for chunk in response:
+        ## a chunk can carry only a finish reason (e.g. a safety stop) and no parts,
+        ## and .text raises on those
+        if chunk.candidates and chunk.candidates[0].content.parts:
+            yield chunk.text
+
+## any other finish reason means Gemini blocked or cut off the answer
+NORMAL_FINISH_REASONS={"STOP","MAX_TOKENS","FINISH_REASON_UNSPECIFIED"}
+
+def blocked_reason(response):
+    if not response.candidates:
+        return response.prompt_feedback.block_reason.name
+    reason=response.candidates[0].finish_reason.name
+    return None if reason in NORMAL_FINISH_REASONS else reason
+
+### answers already generated, shared by all sessions of this process
+## bounded so a long-running deployment doesn't grow without limit, and expired
+## after an hour so a single sampled answer isn't pinned for the life of the process
+MAX_CACHED_RESPONSES=256
+RESPONSE_TTL=60*60
+
+@st.cache_resource
+def load_response_cache():
+    return OrderedDict(),threading.Lock()
+
+def get_cached_response(key):
+    cache,lock=load_response_cache()
+    with lock:
+        entry=cache.get(key)
+        if entry is None:
+            return None
+        expires_at,response=entry
+        if expires_at<time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return response
+
+def remember_response(key,response):
+    cache,lock=load_response_cache()
+    with lock:
+        cache[key]=(time.monotonic()+RESPONSE_TTL,response)
+        cache.move_to_end(key)
+        if len(cache)>MAX_CACHED_RESPONSES:
+            cache.popitem(last=False)
+
+def write_response(model_name,key,contents):
+    ## show the cached answer if there is one, otherwise stream it and remember it
+    key=(model_name,key)
+    response=get_cached_response(key)
+    if response is None:
+        try:
+            stream=get_gemini_response(model_name,contents)
+            response=st.write_stream(stream_text(stream))
+        except exceptions.GoogleAPIError as e:
+            st.error(f"The Gemini API request failed: {e}")
+            return
+        reason=blocked_reason(stream)
+        if reason:
+            st.warning(f"Gemini stopped this answer early ({reason}).")
+            return
+        remember_response(key,response)
+    else:
+        st.write(response)
@@ -3,38 +3,38 @@ load_dotenv()
 
 import streamlit  as st
 import os
+import hashlib
 import google.generativeai as genai 
-from PIL import Image
+from gemini_helpers import MAX_IMAGE_BYTES,MAX_PROMPT_CHARS,write_response
 
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-### function to load Gemini model
-model=genai.GenerativeModel('gemini-pro-vision')
-def get_gemini_response(input,image):
-    if input=="":
-        response=model.generate_content([input,image])
-    else:
-        response=model.generate_content(image)
-    return response.text
-
 ### intitialize streamlit app
 
 st.set_page_config(page_title="Gemini Image Model")
 
 st.header("Gemini Application")
-input=st.text_input("Input Prompt: ",key="input")
+input=st.text_input("Input Prompt: ",key="input",max_chars=MAX_PROMPT_CHARS)
 
 uploaded_file = st.file_uploader("Choose an image...",type=["jpg","jpeg","png"])
 image=""
-if uploaded_file is not None:
-    image = Image.open(uploaded_file)
-    st.image(image, caption="Uploaded Image.",use_column_width=True)
+if uploaded_file is not None and uploaded_file.size>MAX_IMAGE_BYTES:
+    st.warning(f"This image is too large. Please upload one under {MAX_IMAGE_BYTES//(1024*1024)} MB.")
+elif uploaded_file is not None:
+    ## pass the uploaded bytes to Gemini as-is; st.image gets them too, which saves
+    ## re-encoding a PIL image (Streamlit still opens, and resizes wide images, itself)
+    image = {"mime_type":uploaded_file.type,"data":uploaded_file.getvalue()}
+    st.image(image["data"], caption="Uploaded Image.",use_column_width=True)
 
 submit=st.button("Tell me about the image")
 
 ### if submit is clicked
 
-if submit:
-    response=get_gemini_response(input,image)
+if submit and image=="":
+    st.warning("Please upload an image first.")
+elif submit:
     st.subheader("The Response is")
-    st.write(response)
\ No newline at end of file
+    ## same prompt on the same image bytes gives the same cache entry
+    key=(input,hashlib.sha256(image["data"]).hexdigest())
+    contents=[input,image] if input.strip() else image
+    write_response('gemini-pro-vision',key,contents)
\ No newline at end of file